@@ -9,19 +9,6 @@
  * Solver
  */
 
-void get_n_examples_by_class(const bool* example_is_included, const long* y, const int &n_examples, int &n_negative, int &n_positive){
-    for(int i = 0; i < n_examples; i++){
-        if(example_is_included[i]){
-            if(y[i] == 0){
-                n_negative ++;
-            }
-            else{
-                n_positive ++;
-            }
-        }
-    }
-}
-
 void update_optimal_solution(BestUtility &best_solution, int const &feature_idx, double const &threshold,
                              int const &N, int const &P_bar, double const &p, double const &feature_weight,
                              int const &n_negative, int const &n_positive){
@@ -48,74 +35,156 @@ void update_optimal_solution(BestUtility &best_solution, int const &feature_idx,
     }
 }
 
-int find_max(double p,
-             double *X,
-             long *y,
-             long *Xas,
-             long *example_idx,
-             double *feature_weights,
-             int n_examples_included,
-             int n_examples,
-             int n_features,
-             BestUtility &out_best_solution){
-
-    // Make a mask that tells us which examples should be considered in the utility calculations
-    bool *example_is_included = new bool[n_examples];
-    std::fill_n(example_is_included, n_examples, false);
-    
-    for(int i = 0; i < n_examples_included; i++){
-        example_is_included[example_idx[i]] = true;
-    }
-
-    // Find the number of positive and negative examples
-    int n_negative = 0, n_positive = 0;
-    get_n_examples_by_class(example_is_included, y, n_examples, n_negative, n_positive);
+/*
+ * Scans the sorted values of each feature and updates the optimal solution. The inclusion check is a template
+ * parameter so that the compiler generates a version of the inner loop without it, which is used when the argsort
+ * only contains included examples (the case during training, see SetCoveringMachineClassifier.fit).
+ */
+template <bool check_inclusion>
+void find_max_by_feature(double p,
+                         double *X,
+                         intptr_t X_row_stride,
+                         intptr_t X_col_stride,
+                         intptr_t *y,
+                         intptr_t *Xas,
+                         bool *example_is_included,
+                         double *feature_weights,
+                         int n_sorted,
+                         int n_features,
+                         int n_negative,
+                         int n_positive,
+                         BestUtility &out_best_solution){
 
-    // Utility calculations start
     for(int i = 0; i < n_features; i++){
 
         // For each threshold of this feature (a threshold is an example's feature value)
         int N, P_bar, prev_N, prev_P_bar;
         double prev_threshold;
 
+        double feature_weight = feature_weights ? feature_weights[i] : 1.0;
+
+        // If all the (included) examples have the same value for this feature, there is a single threshold and all
+        // examples fall on the same side of it. The utilities are obtained from the class counts without scanning.
+        if(!check_inclusion && n_sorted > 0){
+            double first_threshold = X[Xas[i * n_sorted] * X_row_stride + i * X_col_stride];
+            double last_threshold = X[Xas[i * n_sorted + n_sorted - 1] * X_row_stride + i * X_col_stride];
+            if(equal(first_threshold, last_threshold)){
+                update_optimal_solution(out_best_solution, i, last_threshold, n_negative, n_positive, p,
+                                        feature_weight, n_negative, n_positive);
+                continue;
+            }
+        }
+
         prev_N = 0;
         prev_P_bar = 0;
         prev_threshold = -INFINITY;
-        for(int j = 0; j < n_examples; j++){
+        for(int j = 0; j < n_sorted; j++){
 
             // Get the index of the next example according to the sorting
-            long idx = Xas[i * n_examples + j];
+            intptr_t idx = Xas[i * n_sorted + j];
 
             // Consider this example only if it is included in the calculations
-            if(example_is_included[idx]){
+            if(!check_inclusion || example_is_included[idx]){
 
                 // Get the example's label and threshold
-                long label = y[idx];
-                double threshold = X[idx * n_features + i];
+                intptr_t label = y[idx];
+                double threshold = X[idx * X_row_stride + i * X_col_stride];
 
                 // Wait for the last example with this threshold before computing the utilities
                 if(prev_threshold != -INFINITY && not_equal(threshold, prev_threshold)){
-                    update_optimal_solution(out_best_solution, i, prev_threshold, N, P_bar, p, feature_weights[i],
+                    update_optimal_solution(out_best_solution, i, prev_threshold, N, P_bar, p, feature_weight,
                                             n_negative, n_positive);
                 }
 
-                if(label == 1){
-                    P_bar = prev_P_bar + 1;
-                    N = prev_N;
-                }
-                else{
-                    P_bar = prev_P_bar;
-                    N = prev_N + 1;
-                }
+                // Branchless update of the counts (the labels are not predictable in the sorted order)
+                int is_positive = (label == 1);
+                P_bar = prev_P_bar + is_positive;
+                N = prev_N + 1 - is_positive;
 
                 prev_N = N;
                 prev_P_bar = P_bar;
                 prev_threshold = threshold;
             }
         }
-        update_optimal_solution(out_best_solution, i, prev_threshold, N, P_bar, p, feature_weights[i],
+        update_optimal_solution(out_best_solution, i, prev_threshold, N, P_bar, p, feature_weight,
                                 n_negative, n_positive);
     }
+}
+
+int find_max(double p,
+             double *X,
+             intptr_t X_row_stride,
+             intptr_t X_col_stride,
+             intptr_t *y,
+             intptr_t *Xas,
+             intptr_t *example_idx,
+             double *feature_weights,
+             int n_examples_included,
+             int n_examples,
+             int n_sorted,
+             int n_features,
+             BestUtility &out_best_solution){
+
+    // Make a mask that tells us which examples should be considered in the utility calculations and, in the same
+    // pass over the included examples, find the number of positive and negative examples
+    bool *example_is_included = new bool[n_examples];
+    std::fill_n(example_is_included, n_examples, false);
+
+    int n_negative = 0, n_positive = 0;
+    for(int i = 0; i < n_examples_included; i++){
+        intptr_t idx = example_idx[i];
+        if(example_is_included[idx]){
+            continue;  // Duplicate index, already counted
+        }
+        example_is_included[idx] = true;
+        if(y[idx] == 0){
+            n_negative ++;
+        }
+        else{
+            n_positive ++;
+        }
+    }
+
+    // An argsort restricted to a subset of the examples must contain exactly the included examples. Check this for
+    // every feature in O(n_sorted) per feature: each included example is unmarked when it is found, so indices that
+    // are out of range, not included or repeated are detected, and the marks are then restored.
+    int n_included = n_negative + n_positive;
+    if(n_sorted < n_examples){
+        bool valid = n_sorted == n_included;
+        for(int i = 0; valid && i < n_features; i++){
+            intptr_t *Xas_feature = Xas + (intptr_t)i * n_sorted;
+            int j = 0;
+            for(; j < n_sorted; j++){
+                intptr_t idx = Xas_feature[j];
+                if(idx < 0 || idx >= n_examples || !example_is_included[idx]){
+                    valid = false;
+                    break;
+                }
+                example_is_included[idx] = false;
+            }
+            for(int k = 0; k < j; k++){
+                example_is_included[Xas_feature[k]] = true;
+            }
+        }
+        if(!valid){
+            delete [] example_is_included;
+            return INVALID_ARGSORT;
+        }
+    }
+
+    // Utility calculations start
+    // If the argsort has as many examples as there are included examples, either it holds every example and all are
+    // included, or it is restricted and every feature was checked to hold exactly the included examples (see above).
+    // In both cases, the inclusion check can be skipped.
+    if(n_sorted == n_included){
+        find_max_by_feature<false>(p, X, X_row_stride, X_col_stride, y, Xas, example_is_included, feature_weights,
+                                   n_sorted, n_features, n_negative, n_positive, out_best_solution);
+    }
+    else{
+        find_max_by_feature<true>(p, X, X_row_stride, X_col_stride, y, Xas, example_is_included, feature_weights,
+                                  n_sorted, n_features, n_negative, n_positive, out_best_solution);
+    }
+
     delete [] example_is_included;
     return 0;
 }
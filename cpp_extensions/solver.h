@@ -19,18 +19,24 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #ifndef CPP_EXTENSIONS_UTILITY_H
 #define CPP_EXTENSIONS_UTILITY_H
 
+#include <cstdint>
 #include <vector>
 
 #include "best_utility.h"
 
+#define INVALID_ARGSORT 1
+
 int find_max(double p,
              double *X,
-             long *y,
-             long *Xas,
-             long *example_idx,
-             double *feature_weights,
+             intptr_t X_row_stride, // strides are in number of elements, so X can be row or column-major
+             intptr_t X_col_stride,
+             intptr_t *y,
+             intptr_t *Xas,
+             intptr_t *example_idx,
+             double *feature_weights, // NULL for unit weights
              int n_examples_included, // examples that we are allowed to look at
              int n_examples,
+             int n_sorted, // examples in the argsort of each feature (all, or exactly the included examples)
              int n_features,
              BestUtility &out_best_solution);
 
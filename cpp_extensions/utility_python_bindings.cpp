@@ -25,27 +25,27 @@ find_max(PyObject *self, PyObject *args){
     }
 
     // Check the type of the numpy arrays
-    if(PyArray_TYPE(X) != PyArray_DOUBLE){
+    if(PyArray_TYPE(X) != NPY_DOUBLE){
         PyErr_SetString(PyExc_TypeError,
                         "X must be numpy.ndarray type double");
         return NULL;
     }
-    if(PyArray_TYPE(y) != PyArray_LONG){
+    if(!PyArray_ISINTEGER(y)){
         PyErr_SetString(PyExc_TypeError,
                         "y must be numpy.ndarray type int");
         return NULL;
     }
-    if(PyArray_TYPE(X_argsort_by_feature) != PyArray_LONG){
+    if(!PyArray_ISINTEGER(X_argsort_by_feature)){
         PyErr_SetString(PyExc_TypeError,
                         "X_argsort_by_feature must be numpy.ndarray type int");
         return NULL;
     }
-    if(PyArray_TYPE(example_idx) != PyArray_LONG){
+    if(!PyArray_ISINTEGER(example_idx)){
         PyErr_SetString(PyExc_TypeError,
                         "example_idx must be numpy.ndarray type int");
         return NULL;
     }
-    if(feature_weights && PyArray_TYPE(feature_weights) != PyArray_DOUBLE){
+    if(feature_weights && PyArray_TYPE(feature_weights) != NPY_DOUBLE){
         PyErr_SetString(PyExc_TypeError,
                         "feature_weights must be numpy.ndarray type double");
         return NULL;
@@ -95,9 +95,9 @@ find_max(PyObject *self, PyObject *args){
                         "X and y must have the same number of rows");
         return NULL;
     }
-    if(X_dim0 != X_argsort_by_feature_dim1){
+    if(X_argsort_by_feature_dim1 > X_dim0){
         PyErr_SetString(PyExc_TypeError,
-                        "X must have as many rows as X_argsort_by_feature has columns.");
+                        "X_argsort_by_feature cannot have more columns than X has rows.");
         return NULL;
     }
     if(X_dim1 != X_argsort_by_feature_dim0){
@@ -112,26 +112,70 @@ find_max(PyObject *self, PyObject *args){
     }
 
     // Extract the data pointer from the number arrays
-    double *X_data;
-    long *y_data, *X_argsort_by_feature_data, *example_idx_data;
-    X_data = (double*)PyArray_DATA(PyArray_GETCONTIGUOUS(X));
-    y_data = (long*)PyArray_DATA(PyArray_GETCONTIGUOUS(y));
-    X_argsort_by_feature_data = (long*)PyArray_DATA(PyArray_GETCONTIGUOUS(X_argsort_by_feature));
-    example_idx_data = (long*)PyArray_DATA(PyArray_GETCONTIGUOUS(example_idx));
+    // X is scanned one feature at a time, so its memory layout is preserved and its strides are passed to the solver.
+    // Column-major (Fortran-ordered) X therefore has the values of each feature stored contiguously.
+    PyArrayObject *X_aligned = (PyArrayObject*)PyArray_FROM_OF((PyObject*)X, NPY_ARRAY_ALIGNED);
+    if(X_aligned == NULL){
+        return NULL;
+    }
+    npy_intp X_row_stride = PyArray_STRIDE(X_aligned, 0) / (npy_intp)sizeof(double);
+    npy_intp X_col_stride = PyArray_STRIDE(X_aligned, 1) / (npy_intp)sizeof(double);
 
-    double *feature_weights_data;
+    // The other arrays are only copied if they are not already contiguous. Integer arrays of any (safely castable)
+    // type are converted once to npy_intp, the type of indices and argsort outputs, so the solver has a single code
+    // path. These are new references that must be released instead of the (borrowed) arguments.
+    PyArrayObject *y_contiguous = (PyArrayObject*)PyArray_FROM_OTF((PyObject*)y, NPY_INTP, NPY_ARRAY_IN_ARRAY);
+    PyArrayObject *X_argsort_by_feature_contiguous = (PyArrayObject*)PyArray_FROM_OTF((PyObject*)X_argsort_by_feature,
+                                                                                      NPY_INTP, NPY_ARRAY_IN_ARRAY);
+    PyArrayObject *example_idx_contiguous = (PyArrayObject*)PyArray_FROM_OTF((PyObject*)example_idx, NPY_INTP,
+                                                                             NPY_ARRAY_IN_ARRAY);
+    PyArrayObject *feature_weights_contiguous = NULL;
     if(feature_weights){
-        feature_weights_data = (double*)PyArray_DATA(PyArray_GETCONTIGUOUS(feature_weights));
+        feature_weights_contiguous = PyArray_GETCONTIGUOUS(feature_weights);
+    }
+    if(y_contiguous == NULL || X_argsort_by_feature_contiguous == NULL || example_idx_contiguous == NULL ||
+       (feature_weights && feature_weights_contiguous == NULL)){
+        Py_DECREF(X_aligned);
+        Py_XDECREF(y_contiguous);
+        Py_XDECREF(X_argsort_by_feature_contiguous);
+        Py_XDECREF(example_idx_contiguous);
+        Py_XDECREF(feature_weights_contiguous);
+        return NULL;
     }
-    else{
-        feature_weights_data = new double[X_dim1];
-        std::fill_n(feature_weights_data, X_dim1, 1);
+
+    double *X_data;
+    npy_intp *y_data, *X_argsort_by_feature_data, *example_idx_data;
+    X_data = (double*)PyArray_DATA(X_aligned);
+    y_data = (npy_intp*)PyArray_DATA(y_contiguous);
+    X_argsort_by_feature_data = (npy_intp*)PyArray_DATA(X_argsort_by_feature_contiguous);
+    example_idx_data = (npy_intp*)PyArray_DATA(example_idx_contiguous);
+
+    // Without feature weights, the solver uses unit weights (no buffer of ones needs to be allocated)
+    double *feature_weights_data = NULL;
+    if(feature_weights){
+        feature_weights_data = (double*)PyArray_DATA(feature_weights_contiguous);
     }
 
+    // The solver only works on raw buffers, so release the GIL to let other Python threads run (e.g., parallel fits)
     BestUtility best_solution(100);
-    int status = find_max(p, X_data, y_data, X_argsort_by_feature_data, example_idx_data, feature_weights_data,
-                          example_idx_dim0, X_dim0, X_dim1, best_solution);
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = find_max(p, X_data, X_row_stride, X_col_stride, y_data, X_argsort_by_feature_data, example_idx_data,
+                      feature_weights_data, example_idx_dim0, X_dim0, X_argsort_by_feature_dim1, X_dim1, best_solution);
+    Py_END_ALLOW_THREADS
 
+    Py_DECREF(X_aligned);
+    Py_DECREF(y_contiguous);
+    Py_DECREF(X_argsort_by_feature_contiguous);
+    Py_DECREF(example_idx_contiguous);
+    Py_XDECREF(feature_weights_contiguous);
+
+    if(status == INVALID_ARGSORT){
+        PyErr_SetString(PyExc_TypeError,
+                        "X_argsort_by_feature must contain exactly the examples in example_idx when it has fewer "
+                        "columns than X has rows");
+        return NULL;
+    }
     if(status != 0){
         PyErr_SetString(PyExc_TypeError,
                         "An error occurred in the solver");
@@ -143,20 +187,20 @@ find_max(PyObject *self, PyObject *args){
     double opti_utility = best_solution.best_utility;
 
     npy_intp dims[] = {best_solution.best_n_equiv};
-    PyObject *opti_feat_idx = PyArray_SimpleNew(1, dims, PyArray_LONG);
-    long *opti_feat_idx_data = (long*)PyArray_DATA(opti_feat_idx);
+    PyObject *opti_feat_idx = PyArray_SimpleNew(1, dims, NPY_LONG);
+    long *opti_feat_idx_data = (long*)PyArray_DATA((PyArrayObject*)opti_feat_idx);
 
-    PyObject *opti_thresholds = PyArray_SimpleNew(1, dims, PyArray_DOUBLE);
-    double *opti_thresholds_data = (double*)PyArray_DATA(opti_thresholds);
+    PyObject *opti_thresholds = PyArray_SimpleNew(1, dims, NPY_DOUBLE);
+    double *opti_thresholds_data = (double*)PyArray_DATA((PyArrayObject*)opti_thresholds);
 
-    PyObject *opti_kinds = PyArray_SimpleNew(1, dims, PyArray_LONG);
-    long *opti_kinds_data = (long*)PyArray_DATA(opti_kinds);
+    PyObject *opti_kinds = PyArray_SimpleNew(1, dims, NPY_LONG);
+    long *opti_kinds_data = (long*)PyArray_DATA((PyArrayObject*)opti_kinds);
 
-    PyObject *opti_N = PyArray_SimpleNew(1, dims, PyArray_LONG);
-    long *opti_N_data = (long*)PyArray_DATA(opti_N);
+    PyObject *opti_N = PyArray_SimpleNew(1, dims, NPY_LONG);
+    long *opti_N_data = (long*)PyArray_DATA((PyArrayObject*)opti_N);
 
-    PyObject *opti_P_bar = PyArray_SimpleNew(1, dims, PyArray_LONG);
-    long *opti_P_bar_data = (long*)PyArray_DATA(opti_P_bar);
+    PyObject *opti_P_bar = PyArray_SimpleNew(1, dims, NPY_LONG);
+    long *opti_P_bar_data = (long*)PyArray_DATA((PyArrayObject*)opti_P_bar);
 
     for(int i = 0; i < best_solution.best_n_equiv; i++){
         opti_feat_idx_data[i] = best_solution.best_feat_idx[i];
@@ -166,18 +210,6 @@ find_max(PyObject *self, PyObject *args){
         opti_P_bar_data[i] = best_solution.best_P_bar[i];
     }
 
-    if (feature_weights){
-        Py_DECREF(feature_weights);
-    }
-    else{
-        delete [] feature_weights_data;
-    }
-
-    Py_DECREF(X);
-    Py_DECREF(y);
-    Py_DECREF(X_argsort_by_feature);
-    Py_DECREF(example_idx);
-
     return Py_BuildValue("d,N,N,N,N,N",
                          opti_utility,
                          opti_feat_idx,
@@ -67,8 +67,8 @@ class ConjunctionModel(BaseModel):
     def predict(self, X):
         predictions = np.ones(X.shape[0], bool)
         for a in self.rules:
-            predictions = np.logical_and(predictions, a.classify(X))
-        return predictions.astype(np.uint8)
+            np.logical_and(predictions, a.classify(X), out=predictions)
+        return predictions.view(np.uint8)
 
     @property
     def type(self):
@@ -82,8 +82,8 @@ class DisjunctionModel(BaseModel):
     def predict(self, X):
         predictions = np.zeros(X.shape[0], bool)
         for a in self.rules:
-            predictions = np.logical_or(predictions, a.classify(X))
-        return predictions.astype(np.uint8)
+            np.logical_or(predictions, a.classify(X), out=predictions)
+        return predictions.view(np.uint8)
 
     @property
     def type(self):
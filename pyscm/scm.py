@@ -92,10 +92,10 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
 
         if self.model_type == "conjunction":
             self._add_attribute_to_model = self._append_conjunction_model
-            self._get_example_idx_by_class = self._get_example_idx_by_class_conjunction
+            positive_label = 1
         elif self.model_type == "disjunction":
             self._add_attribute_to_model = self._append_disjunction_model
-            self._get_example_idx_by_class = self._get_example_idx_by_class_disjunction
+            positive_label = 0
         else:
             raise ValueError("Unsupported model type.")
 
@@ -114,7 +114,8 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
         # Validate the input data
         logging.debug("Validating the input data")
         X, y = check_X_y(X, y)
-        X = np.asarray(X, dtype=np.double)
+        # Column-major storage makes the values of each feature contiguous for the solver
+        X = np.asarray(X, dtype=np.double, order="F")
         self.classes_, y, total_n_ex_by_class = np.unique(
             y, return_inverse=True, return_counts=True
         )
@@ -132,14 +133,11 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
 
         # Invert the classes if we are learning a disjunction
         logging.debug("Preprocessing example labels")
-        pos_ex_idx, neg_ex_idx = self._get_example_idx_by_class(y)
-        y = np.zeros(len(y), dtype=int)
-        y[pos_ex_idx] = 1
-        y[neg_ex_idx] = 0
+        y = (y == positive_label).astype(int)
 
         # Presort all the features
         logging.debug("Presorting all features")
-        X_argsort_by_feature_T = np.argsort(X, axis=0).T.copy()
+        X_argsort_by_feature_T = np.ascontiguousarray(np.argsort(X, axis=0).T)
 
         # Create an empty model
         logging.debug("Initializing empty model")
@@ -151,11 +149,9 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
 
         logging.debug("Training start")
         remaining_example_idx = np.arange(len(y))
-        remaining_negative_example_idx = neg_ex_idx
-        while (
-            len(remaining_negative_example_idx) > 0
-            and len(self.model_) < self.max_rules
-        ):
+        is_remaining = np.ones(len(y), dtype=bool)
+        n_remaining_negatives = len(y) - y.sum()
+        while n_remaining_negatives > 0 and len(self.model_) < self.max_rules:
             logging.debug("Finding the optimal rule to add to the model")
             (
                 opti_utility,
@@ -165,22 +161,18 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
                 opti_N,
                 opti_P_bar,
             ) = self._get_best_utility_rules(
-                X.copy(),
-                y.copy(),
-                X_argsort_by_feature_T.copy(),
-                remaining_example_idx.copy(),
+                X,
+                y,
+                X_argsort_by_feature_T,
+                remaining_example_idx,
                 **utility_function_additional_args
             )
 
-            logging.debug(
-                "Tiebreaking. Found {0:d} optimal rules".format(len(opti_feat_idx))
-            )
+            logging.debug("Tiebreaking. Found %d optimal rules", len(opti_feat_idx))
             if len(opti_feat_idx) > 1:
                 if tiebreaker is None:
                     training_risk_decrease = 1.0 * opti_N - opti_P_bar
-                    keep_idx = np.where(
-                        training_risk_decrease == training_risk_decrease.max()
-                    )[0][0]
+                    keep_idx = np.argmax(training_risk_decrease)  # first of the maxima
                 else:
                     keep_idx = tiebreaker(
                         self.model_type, opti_feat_idx, opti_threshold, opti_kind
@@ -193,22 +185,32 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
                 kind="greater" if opti_kind[keep_idx] == 0 else "less_equal",
             )
 
-            logging.debug("The best rule has utility {0:.3f}".format(opti_utility))
+            logging.debug("The best rule has utility %.3f", opti_utility)
             self._add_attribute_to_model(stump)
 
             logging.debug(
                 "Discarding all examples that the rule classifies as negative"
             )
-            remaining_example_idx = remaining_example_idx[
-                stump.classify(X[remaining_example_idx])
-            ]
-            remaining_negative_example_idx = remaining_negative_example_idx[
-                stump.classify(X[remaining_negative_example_idx])
-            ]
+            # Classifying all examples reads one contiguous column of X instead of
+            # gathering the remaining rows
+            stump_classifications = stump.classify(X)
+            is_kept = stump_classifications[remaining_example_idx]
+            is_remaining[remaining_example_idx[~is_kept]] = False
+            remaining_example_idx = remaining_example_idx[is_kept]
+            # The remaining negatives are the remaining examples with label 0
+            n_remaining_negatives = (
+                len(remaining_example_idx) - y[remaining_example_idx].sum()
+            )
+
+            # Drop the discarded examples from the presorted features so the solver only
+            # scans remaining examples
+            X_argsort_by_feature_T = X_argsort_by_feature_T[
+                is_remaining[X_argsort_by_feature_T]
+            ].reshape(X.shape[1], -1)
             logging.debug(
-                "There are {0:d} examples remaining ({1:d} negatives)".format(
-                    len(remaining_example_idx), len(remaining_negative_example_idx)
-                )
+                "There are %d examples remaining (%d negatives)",
+                len(remaining_example_idx),
+                n_remaining_negatives,
             )
 
             iteration_callback(self.model_)
@@ -217,9 +219,16 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
 
         logging.debug("Calculating rule importances")
         # Definition: how often each rule outputs a value that causes the value of the model to be final
+        # Each rule is applied to X once: the model outputs the final outcome iff any
+        # of its rules does
         final_outcome = 0 if self.model_type == "conjunction" else 1
-        total_outcome = (self.model_.predict(X) == final_outcome).sum()  # n times the model outputs the final outcome
-        self.rule_importances_ = np.array([(r.classify(X) == final_outcome).sum() / total_outcome for r in self.model_.rules])  # contribution of each rule
+        rule_is_final = np.empty((len(self.model_), X.shape[0]), dtype=bool)
+        for i, r in enumerate(self.model_.rules):
+            rule_is_final[i] = r.classify(X) == final_outcome
+        # n times the model outputs the final outcome
+        total_outcome = rule_is_final.any(axis=0).sum()
+        # contribution of each rule
+        self.rule_importances_ = rule_is_final.sum(axis=1) / total_outcome
         logging.debug("Done.")
 
         return self
@@ -302,27 +311,46 @@ class BaseSetCoveringMachine(BaseEstimator, ClassifierMixin):
         X, y = check_X_y(X, y)
         return accuracy_score(y_true=y, y_pred=self.predict(X))
 
+    def _get_best_utility_rules(self, X, y, X_argsort_by_feature_T, example_idx):
+        """
+        Finds the rules of maximum utility. Called at each training iteration.
+
+        Parameters:
+        -----------
+        X: array-like, shape=(n_examples, n_features), dtype=np.double
+            The features of all the training examples (column-major).
+        y: array-like, shape=(n_examples,), dtype=int
+            The labels of all the training examples (1 for positive, 0 for negative).
+        X_argsort_by_feature_T: array-like, shape=(n_features, n_remaining)
+            For each feature, the indices of the remaining examples sorted by feature
+            value. This holds exactly the examples in example_idx.
+        example_idx: array-like, shape=(n_remaining,), dtype=int
+            The indices of the examples that remain to be covered.
+
+        Returns:
+        --------
+        solution: tuple
+            The optimal utility and the feature indices, thresholds, kinds, N and
+            P_bar of the equivalent optimal rules (see find_max).
+
+        Notes:
+        -----
+        The inputs are shared with the training loop and must be treated as read-only.
+
+        """
+        raise NotImplementedError()
+
     def _append_conjunction_model(self, new_rule):
         self.model_.add(new_rule)
-        logging.debug("Attribute added to the model: " + str(new_rule))
+        logging.debug("Attribute added to the model: %s", new_rule)
         return new_rule
 
     def _append_disjunction_model(self, new_rule):
         new_rule = new_rule.inverse()
         self.model_.add(new_rule)
-        logging.debug("Attribute added to the model: " + str(new_rule))
+        logging.debug("Attribute added to the model: %s", new_rule)
         return new_rule
 
-    def _get_example_idx_by_class_conjunction(self, y):
-        positive_example_idx = np.where(y == 1)[0]
-        negative_example_idx = np.where(y == 0)[0]
-        return positive_example_idx, negative_example_idx
-
-    def _get_example_idx_by_class_disjunction(self, y):
-        positive_example_idx = np.where(y == 0)[0]
-        negative_example_idx = np.where(y == 1)[0]
-        return positive_example_idx, negative_example_idx
-
     def __str__(self):
         return _class_to_string(self)
 
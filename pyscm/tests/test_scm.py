@@ -0,0 +1,98 @@
+from __future__ import print_function, division, absolute_import, unicode_literals
+
+import numpy as np
+
+from unittest import TestCase
+
+from ..scm import SetCoveringMachineClassifier
+
+
+class SetCoveringMachineTests(TestCase):
+    def test_learned_models(self):
+        """
+        Test that models with several rules and tied features are learned as expected
+        """
+        rs = np.random.RandomState(42)
+        X = rs.rand(60, 8).round(1)
+        y = rs.randint(2, size=60)
+
+        expected_rules = {
+            ("conjunction", 0.5): [
+                (3, 0.4, "less_equal"),
+                (3, 0.1, "greater"),
+                (1, 0.0, "greater"),
+            ],
+            ("conjunction", 2.0): [
+                (2, 0.1, "greater"),
+                (7, 0.0, "greater"),
+                (3, 0.9, "less_equal"),
+                (0, 1.0, "less_equal"),
+                (0, 1.0, "less_equal"),
+            ],
+            ("disjunction", 0.5): [(2, 0.1, "greater"), (7, 0.4, "less_equal")],
+            ("disjunction", 2.0): [
+                (3, 0.4, "less_equal"),
+                (5, 0.9, "greater"),
+                (1, 0.0, "less_equal"),
+                (5, 0.0, "less_equal"),
+                (3, 0.5, "less_equal"),
+            ],
+        }
+        for (model_type, p), rules in expected_rules.items():
+            clf = SetCoveringMachineClassifier(p=p, model_type=model_type, max_rules=5)
+            clf.fit(X, y)
+            self.assertEqual(len(clf.model_), len(rules))
+            for rule, (feature_idx, threshold, kind) in zip(clf.model_.rules, rules):
+                self.assertEqual(rule.feature_idx, feature_idx)
+                np.testing.assert_almost_equal(actual=rule.threshold, desired=threshold)
+                self.assertEqual(rule.kind, kind)
+
+    def test_rule_importances(self):
+        """
+        Test that the rule importances match their definition
+        """
+        rs = np.random.RandomState(0)
+        for model_type, final_outcome in [("conjunction", 0), ("disjunction", 1)]:
+            for _ in range(10):
+                X = rs.rand(100, 10).round(rs.randint(0, 3))
+                y = rs.randint(2, size=100)
+
+                # Models that never output the final outcome have undefined (nan) importances
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    clf = SetCoveringMachineClassifier(
+                        p=rs.rand() * 5.0, model_type=model_type, max_rules=5
+                    ).fit(X, y)
+
+                    total_outcome = (clf.model_.predict(X) == final_outcome).sum()
+                    expected = [
+                        (r.classify(X) == final_outcome).sum() / total_outcome
+                        for r in clf.model_.rules
+                    ]
+                np.testing.assert_almost_equal(
+                    actual=clf.rule_importances_, desired=expected
+                )
+
+    def test_rule_importances_callback_removes_rule(self):
+        """
+        Test that the rule importances follow the model when the iteration callback modifies it
+        """
+        rs = np.random.RandomState(1)
+        X = rs.rand(100, 10)
+        y = rs.randint(2, size=100)
+
+        removed = []
+
+        def remove_first_rule(model):
+            if len(model) == 2 and not removed:
+                removed.append(model.rules[0])
+                model.remove(0)
+
+        clf = SetCoveringMachineClassifier(p=1.0, max_rules=3)
+        clf.fit(X, y, iteration_callback=remove_first_rule)
+        self.assertEqual(len(removed), 1)
+
+        total_outcome = (clf.model_.predict(X) == 0).sum()
+        expected = [
+            (r.classify(X) == 0).sum() / total_outcome for r in clf.model_.rules
+        ]
+        np.testing.assert_almost_equal(actual=clf.rule_importances_, desired=expected)
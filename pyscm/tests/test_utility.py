@@ -3,7 +3,6 @@ from __future__ import print_function, division, absolute_import, unicode_litera
 import numpy as np
 import sys
 
-from numpy import infty as inf
 from unittest import TestCase
 from sklearn.utils import estimator_checks
 
@@ -273,3 +272,104 @@ class UtilityTests(TestCase):
                         actual=solver_best_utility,
                         desired=max(max(le_rule_utilities), max(g_rule_utilities)),
                     )
+
+    def test_restricted_argsort(self):
+        """
+        Test that the argsort can be restricted to the included examples
+        """
+        X = np.array(
+            [
+                [1, 1, 0.5, 1],
+                [2, 1, 0.5, 1],
+                [2, 1, 0.5, 1],
+                [3, 1, 1.7, 0],
+                [4, 1, 1.7, 0],
+                [5, 1, 1.7, 0],
+                [6, 1, 1.7, 0],
+                [7, 1, 1.7, 0],
+            ],
+            dtype=np.double,
+        )
+        y = np.array([0, 0, 0, 1, 1, 1, 1, 1])
+        Xas = np.argsort(X, axis=0).T.copy()
+        example_idx = np.array([0, 2, 3, 5, 6])
+        p = 1.0
+
+        full = find_max(p, X, y, Xas, example_idx)
+        Xas_restricted = Xas[np.isin(Xas, example_idx)].reshape(X.shape[1], -1)
+        restricted = find_max(p, X, y, Xas_restricted, example_idx)
+        for actual, desired in zip(restricted, full):
+            np.testing.assert_almost_equal(actual=actual, desired=desired)
+
+    def test_memory_layout(self):
+        """
+        Test that the solver does not depend on the memory layout of X
+        """
+        X = np.random.rand(50, 6).round(1)
+        y = np.random.randint(0, 2, 50)
+        Xas = np.argsort(X, axis=0).T.copy()
+        example_idx = np.arange(X.shape[0])
+        p = 2.0
+
+        expected = find_max(p, X, y, Xas, example_idx)
+        for X_layout in [np.asfortranarray(X), np.hstack((X, X))[:, : X.shape[1]]]:
+            result = find_max(p, X_layout, y, Xas, example_idx)
+            for actual, desired in zip(result, expected):
+                np.testing.assert_almost_equal(actual=actual, desired=desired)
+
+    def test_integer_types(self):
+        """
+        Test that the integer arrays can be of any safely castable integer type
+        """
+        X = np.random.rand(30, 4)
+        y = np.random.randint(0, 2, 30)
+        Xas = np.argsort(X, axis=0).T.copy()
+        example_idx = np.arange(X.shape[0])
+        p = 1.0
+
+        expected = find_max(p, X, y, Xas, example_idx)
+        result = find_max(
+            p,
+            X,
+            y.astype(np.int8),
+            Xas.astype(np.int32),
+            example_idx.astype(np.uint16),
+        )
+        for actual, desired in zip(result, expected):
+            np.testing.assert_almost_equal(actual=actual, desired=desired)
+
+    def test_restricted_argsort_validation(self):
+        """
+        Test that a restricted argsort that does not contain exactly the included examples is rejected
+        """
+        X = np.array([[1], [2], [3], [4]], dtype=np.double)
+        y = np.array([0, 0, 1, 1])
+        Xas = np.argsort(X, axis=0).T.copy()
+        example_idx = np.array([0, 1])
+        p = 1.0
+
+        for Xas_restricted in [
+            Xas[:, 2:],  # Examples that are not included
+            Xas[:, :1],  # Missing an included example
+            Xas[:, :3],  # An extra example
+            np.array([[0, 0]]),  # Repeated example
+            np.array([[0, 7]]),  # Out of range
+        ]:
+            with self.assertRaises(TypeError):
+                find_max(p, X, y, np.ascontiguousarray(Xas_restricted), example_idx)
+
+        # The examples can be in any order and the example indices can be repeated
+        find_max(p, X, y, Xas[:, :2].copy(), np.array([1, 0, 1]))
+
+        # Every feature is checked, not only the first one
+        X = np.array([[1, 1], [2, 1], [3, 1], [4, 1]], dtype=np.double)
+        y = np.array([0, 1, 0, 1])
+        example_idx = np.array([0, 1])
+        for Xas_restricted in [
+            [[0, 1], [0, 3]],  # Example that is not included
+            [[0, 1], [0, 2]],  # Example that is not included (same class)
+            [[0, 1], [0, 0]],  # Repeated example
+            [[0, 1], [0, 10**9]],  # Out of range
+        ]:
+            with self.assertRaises(TypeError):
+                find_max(p, X, y, np.array(Xas_restricted), example_idx)